@@ -1,21 +1,62 @@
 """The CynVoice integration."""
 from __future__ import annotations
 
+import shutil
+
+import aiohttp
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE, Platform
+from homeassistant.core import Event, HomeAssistant
 
-from .const import DOMAIN
+from .const import (
+    CACHE_DIR,
+    CONNECTION_LIMIT_PER_HOST,
+    DOMAIN,
+    KEEPALIVE_TIMEOUT,
+)
 
 PLATFORMS: list[Platform] = [Platform.TTS]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up CynVoice from a config entry."""
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    connector = aiohttp.TCPConnector(
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+    )
+    session = aiohttp.ClientSession(connector=connector)
+
+    async def async_close_session(_event: Event | None = None) -> None:
+        await session.close()
+
+    # Config entries are not unloaded on shutdown, so close it then as well
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, async_close_session)
+    )
+    entry.async_on_unload(async_close_session)
+
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = session
+    try:
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    except Exception:
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await session.close()
+        raise
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        # The session itself is closed by the entry's unload callbacks
+        hass.data[DOMAIN].pop(entry.entry_id)
+    return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the audio cache of a removed config entry."""
+    await hass.async_add_executor_job(
+        shutil.rmtree, hass.config.path(CACHE_DIR, entry.entry_id), True
+    )
@@ -0,0 +1,276 @@
+"""Response cache for CynVoice TTS."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor
+from datetime import datetime, timedelta
+import hashlib
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import save_json
+from homeassistant.util.json import load_json
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# Total audio bytes kept in memory
+MEMORY_CACHE_MAX_BYTES = 10 * 1024 * 1024
+# Size cap for the on-disk cache, least recently used files go first
+DISK_CACHE_MAX_BYTES = 200 * 1024 * 1024
+# How long a response stays valid on disk (in seconds)
+DISK_CACHE_TTL = 30 * 24 * 60 * 60
+# How often expired entries are removed from disk
+CACHE_SWEEP_INTERVAL = timedelta(hours=6)
+
+INDEX_FILE = "index.json"
+
+# Fields every index entry needs, with the types they must have
+_ENTRY_FIELDS: dict[str, type | tuple[type, ...]] = {
+    "path": str,
+    "size": int,
+    "createdAt": (int, float),
+    "ttl": (int, float),
+    "accessedAt": (int, float),
+}
+
+
+def cache_key(
+    url: str, text: str, voice: str, temperature: float, repetition_penalty: float
+) -> str:
+    """Return the cache key for a normalized TTS request to the API at url."""
+    return hashlib.blake2b(
+        f"{url}|{voice}|{float(temperature):.3f}|{float(repetition_penalty):.3f}|".encode()
+        + text.encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+
+def _is_valid_entry(entry: Any) -> bool:
+    return isinstance(entry, dict) and all(
+        isinstance(entry.get(field), kind) for field, kind in _ENTRY_FIELDS.items()
+    )
+
+
+class AudioCache:
+    """Two-level (memory + disk) LRU cache of complete WAV responses.
+
+    Files on disk are tracked by an ``index.json`` holding, per key, the
+    file name, format, size, creation time, TTL and last access time, so
+    the cache survives restarts and expired entries can be swept. Disk
+    access only happens between ``open`` and ``close``.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: str) -> None:
+        self._hass = hass
+        self._executor: Executor | None = None
+        self._dir = Path(directory)
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._index: dict[str, dict[str, Any]] | None = None
+        # Serializes index updates and their writes to disk
+        self._lock = asyncio.Lock()
+        self._closed = True
+
+    def open(self, executor: Executor) -> None:
+        """Start running file I/O on executor."""
+        self._executor = executor
+        self._closed = False
+
+    def close(self) -> None:
+        """Stop starting file I/O; later lookups miss and stores stay in memory.
+
+        Work already queued on the executor still runs to completion.
+        """
+        self._closed = True
+
+    async def _async_run(self, func: Callable[..., _T], *args: Any) -> _T | None:
+        """Run blocking file I/O on the cache's executor, None once closed."""
+        if self._closed:
+            return None
+        return await self._hass.loop.run_in_executor(self._executor, func, *args)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > MEMORY_CACHE_MAX_BYTES:
+            return
+        if (old := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(old)
+        self._memory[key] = data
+        self._memory_bytes += len(data)
+        while self._memory_bytes > MEMORY_CACHE_MAX_BYTES:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _forget(self, key: str) -> None:
+        if (old := self._memory.pop(key, None)) is not None:
+            self._memory_bytes -= len(old)
+
+    async def _async_get_index(self) -> dict[str, dict[str, Any]]:
+        """Return the disk index, loading it on first use."""
+        if self._index is None:
+            index = await self._async_run(self._load_index)
+            if index is None:
+                return {}
+            # Another caller may have loaded it while this one waited
+            if self._index is None:
+                self._index = index
+        return self._index
+
+    def _snapshot(self) -> dict[str, dict[str, Any]]:
+        """Copy the index so it can be serialized outside the event loop."""
+        return {key: dict(entry) for key, entry in (self._index or {}).items()}
+
+    async def async_get(self, key: str) -> bytes | None:
+        """Return cached audio for key, or None on a miss."""
+        data = self._memory.get(key)
+        if data is not None:
+            self._memory.move_to_end(key)
+            return data
+
+        index = await self._async_get_index()
+        entry = index.get(key)
+        if entry is None:
+            return None
+        now = time.time()
+        if now - entry["createdAt"] >= entry["ttl"]:
+            return None
+
+        data = await self._async_run(self._read, entry["path"])
+        if data is None:
+            index.pop(key, None)
+            return None
+        entry["accessedAt"] = now
+        self._remember(key, data)
+        return data
+
+    def async_store(self, key: str, data: bytes) -> None:
+        """Cache audio for key; the disk write runs in the background."""
+        self._remember(key, data)
+        if self._closed:
+            return
+        self._hass.async_create_background_task(
+            self._async_persist(key, data), "cynvoice_cache_store"
+        )
+
+    async def _async_persist(self, key: str, data: bytes) -> None:
+        index = await self._async_get_index()
+        async with self._lock:
+            path = f"{key}.wav"
+            if not await self._async_run(self._write, path, data):
+                return
+            now = time.time()
+            index[key] = {
+                "path": path,
+                "format": "wav",
+                "size": len(data),
+                "createdAt": now,
+                "ttl": DISK_CACHE_TTL,
+                "accessedAt": now,
+            }
+
+            # Evict least recently used entries until the cache fits its cap
+            total = sum(entry["size"] for entry in index.values())
+            stale = []
+            for old_key, entry in sorted(
+                index.items(), key=lambda item: item[1]["accessedAt"]
+            ):
+                if total <= DISK_CACHE_MAX_BYTES:
+                    break
+                stale.append(entry["path"])
+                total -= entry["size"]
+                del index[old_key]
+
+            await self._async_run(self._remove_and_save, stale, self._snapshot())
+
+    async def async_sweep(self, _now: datetime | None = None) -> None:
+        """Drop expired entries and any files the index does not track."""
+        index = await self._async_get_index()
+        async with self._lock:
+            now = time.time()
+            for key, entry in list(index.items()):
+                if now - entry["createdAt"] >= entry["ttl"]:
+                    del index[key]
+                    self._forget(key)
+
+            await self._async_run(self._sweep_files, self._snapshot())
+
+    def _load_index(self) -> dict[str, dict[str, Any]]:
+        try:
+            index = load_json(self._dir / INDEX_FILE, default={})
+        except HomeAssistantError as e:
+            _LOGGER.warning("Discarding unreadable TTS cache index: %s", e)
+            return {}
+        if not isinstance(index, dict):
+            return {}
+
+        valid = {key: entry for key, entry in index.items() if _is_valid_entry(entry)}
+        if len(valid) != len(index):
+            _LOGGER.warning(
+                "Dropping %d malformed TTS cache index entries", len(index) - len(valid)
+            )
+        return valid
+
+    def _read(self, path: str) -> bytes | None:
+        try:
+            return (self._dir / path).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            _LOGGER.warning("Failed to read cached TTS audio %s: %s", path, e)
+            return None
+
+    def _write(self, path: str, data: bytes) -> bool:
+        target = self._dir / path
+        tmp_path = target.with_suffix(".tmp")
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, target)
+        except OSError as e:
+            _LOGGER.warning("Failed to write cached TTS audio %s: %s", target, e)
+            return False
+        return True
+
+    def _save_index(self, index: dict[str, dict[str, Any]]) -> None:
+        try:
+            save_json(str(self._dir / INDEX_FILE), index)
+        except HomeAssistantError as e:
+            _LOGGER.warning("Failed to save TTS cache index: %s", e)
+
+    def _remove_and_save(
+        self, paths: list[str], index: dict[str, dict[str, Any]]
+    ) -> None:
+        for path in paths:
+            try:
+                (self._dir / path).unlink()
+            except OSError:
+                continue
+        self._save_index(index)
+
+    def _sweep_files(self, index: dict[str, dict[str, Any]]) -> None:
+        tracked = {entry["path"] for entry in index.values()}
+        try:
+            files = [
+                path for path in self._dir.iterdir()
+                if path.suffix in (".wav", ".tmp") and path.name not in tracked
+            ]
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            _LOGGER.warning("Failed to scan TTS cache directory: %s", e)
+            return
+
+        for path in files:
+            try:
+                path.unlink()
+            except OSError:
+                continue
+        self._save_index(index)
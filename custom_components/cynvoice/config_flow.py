@@ -18,11 +18,16 @@ from .const import (
     CONF_TEMPERATURE,
     CONF_REPETITION_PENALTY,
     CONF_STREAMING,
+    CONF_PARALLEL_SEGMENTS,
+    CONF_ASSUME_FIXED_FORMAT,
     DEFAULT_URL,
     DEFAULT_VOICE,
     DEFAULT_TEMPERATURE,
     DEFAULT_REPETITION_PENALTY,
     DEFAULT_STREAMING,
+    DEFAULT_PARALLEL_SEGMENTS,
+    MAX_PARALLEL_SEGMENTS,
+    DEFAULT_ASSUME_FIXED_FORMAT,
     DOMAIN,
 )
 
@@ -35,6 +40,19 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_VOICE): str,
+        vol.Optional(CONF_TEMPERATURE, default=DEFAULT_TEMPERATURE): vol.Coerce(float),
+        vol.Optional(CONF_REPETITION_PENALTY, default=DEFAULT_REPETITION_PENALTY): vol.Coerce(float),
+        vol.Optional(CONF_STREAMING, default=DEFAULT_STREAMING): bool,
+        vol.Optional(CONF_PARALLEL_SEGMENTS, default=DEFAULT_PARALLEL_SEGMENTS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PARALLEL_SEGMENTS)
+        ),
+        vol.Optional(CONF_ASSUME_FIXED_FORMAT, default=DEFAULT_ASSUME_FIXED_FORMAT): bool,
+    }
+)
+
 class CynVoiceConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for CynVoice."""
 
@@ -76,32 +94,11 @@ class CynVoiceOptionsFlowHandler(config_entries.OptionsFlow):
 
         return self.async_show_form(
             step_id="init",
-            data_schema=vol.Schema(
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA,
                 {
-                    vol.Required(
-                        CONF_VOICE,
-                        default=self._config_entry.options.get(
-                            CONF_VOICE, self._config_entry.data.get(CONF_VOICE, DEFAULT_VOICE)
-                        ),
-                    ): str,
-                    vol.Optional(
-                        CONF_TEMPERATURE,
-                        default=self._config_entry.options.get(
-                            CONF_TEMPERATURE, DEFAULT_TEMPERATURE
-                        ),
-                    ): vol.Coerce(float),
-                    vol.Optional(
-                        CONF_REPETITION_PENALTY,
-                        default=self._config_entry.options.get(
-                            CONF_REPETITION_PENALTY, DEFAULT_REPETITION_PENALTY
-                        ),
-                    ): vol.Coerce(float),
-                    vol.Optional(
-                        CONF_STREAMING,
-                        default=self._config_entry.options.get(
-                            CONF_STREAMING, DEFAULT_STREAMING
-                        ),
-                    ): bool,
-                }
+                    CONF_VOICE: self._config_entry.data.get(CONF_VOICE, DEFAULT_VOICE),
+                    **self._config_entry.options,
+                },
             ),
         )
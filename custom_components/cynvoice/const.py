@@ -14,11 +14,34 @@ CONF_SPEED = "speed"
 CONF_TEMPERATURE = "temperature"
 CONF_REPETITION_PENALTY = "repetition_penalty"
 CONF_STREAMING = "streaming"
+CONF_PARALLEL_SEGMENTS = "parallel_segments"
+CONF_ASSUME_FIXED_FORMAT = "assume_fixed_format"
+CONF_THREAD_POOL_SIZE = "thread_pool_size"
 UNIQUE_ID = "unique_id"
 
 # Default values
 DEFAULT_TEMPERATURE = 0.95
 DEFAULT_REPETITION_PENALTY = 1.1
 DEFAULT_STREAMING = False
+# Number of sentences synthesized concurrently, 1 disables
+DEFAULT_PARALLEL_SEGMENTS = 1
+MAX_PARALLEL_SEGMENTS = 8
+DEFAULT_ASSUME_FIXED_FORMAT = False
+# Worker threads for cache file I/O, kept off Home Assistant's default executor.
+# Only configurable from YAML; config entries always use the default.
+DEFAULT_THREAD_POOL_SIZE = 4
+
+# Output format of the CynVoice API, used when assume_fixed_format is on
+WAV_SAMPLE_RATE = 44100
+WAV_CHANNELS = 1
+WAV_SAMPLE_WIDTH = 2
 
 SUPPORTED_LANGUAGES = ["en"]
+
+# Connection pool for the TTS API: enough parallel connections for
+# multi-room announcements, kept alive across sparse TTS traffic
+CONNECTION_LIMIT_PER_HOST = 8
+KEEPALIVE_TIMEOUT = 75
+
+# Directory (relative to the config dir) for cached TTS responses
+CACHE_DIR = "cynvoice_tts_cache"
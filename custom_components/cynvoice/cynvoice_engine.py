@@ -1,26 +1,180 @@
 """TTS Engine for CynVoice."""
-import json
+import asyncio
 import logging
+import os
+import time
+from typing import AsyncGenerator
+
 import aiohttp
-from typing import Optional, Callable, Union
+from yarl import URL
 
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.json import json_bytes
+
+from .cache import AudioCache, cache_key
+from .utils import merge_wavs
+
+__all__ = ["CynVoiceEngine", "AudioResponse", "DEFAULT_KEEPALIVE_TIMEOUT"]
 
 _LOGGER = logging.getLogger(__name__)
 
+# Upstream read buffer size (in bytes). Each active stream can hold roughly
+# this much, so steady-state RAM is about concurrent streams x CHUNK_SIZE.
+CHUNK_SIZE = int(os.getenv("CYNVOICE_CHUNK", "65536"))
+
+# Upstream chunks buffered between the reader task and the consumer
+STREAM_QUEUE_SIZE = 8
+
+# Use a longer timeout for TTS generation
+_TIMEOUT = aiohttp.ClientTimeout(total=60)
+
+# Connection warm-up is best effort, never hold a request back for long
+_WARM_TIMEOUT = aiohttp.ClientTimeout(total=2)
+
+# aiohttp's default keep-alive timeout for idle pooled connections (in seconds)
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+
+# Backend warm-up runs in the background but may have to wait for a model load
+_WARM_UP_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+_HEADERS = {
+    "Content-Type": "application/json",
+    "accept": "*/*"
+}
+
+
 class AudioResponse:
     """A simple response wrapper."""
     def __init__(self, content: bytes):
         self.content = content
 
 class CynVoiceEngine:
-    def __init__(self, session: aiohttp.ClientSession, url: str, voice: str, temperature: float, repetition_penalty: float, streaming: bool):
+    def __init__(self, session: aiohttp.ClientSession, url: str, voice: str, temperature: float, repetition_penalty: float, streaming: bool, cache: AudioCache | None = None, keepalive_timeout: float = DEFAULT_KEEPALIVE_TIMEOUT):
         self._session = session
-        self._url = url
+        # Idle time after which the session's pool drops a connection
+        self._keepalive_timeout = keepalive_timeout
+        self._cache = cache
+        # Complete audio of running syntheses, None if a stream failed
+        self._inflight: dict[str, asyncio.Future[bytes | None]] = {}
+        # Parse once; aiohttp would otherwise re-parse the string per request
+        self._url = URL(url)
         self._voice = voice
         self._temperature = temperature
         self._repetition_penalty = repetition_penalty
         self._streaming = streaming
+        # Monotonic time of the last upstream response
+        self._last_response = 0.0
+        # Fields that never change between requests
+        self._payload_static = {
+            "chunk_length": 200,
+            "format": "wav",
+            "references": [],
+            "seed": None,
+            "use_memory_cache": "on",
+            "normalize": True,
+            "max_new_tokens": 1024,
+            "top_p": 0.8,
+        }
+
+    def set_defaults(
+        self,
+        voice: str,
+        temperature: float,
+        repetition_penalty: float,
+        streaming: bool,
+    ) -> None:
+        """Change the parameters used when a request does not set them."""
+        self._voice = voice
+        self._temperature = temperature
+        self._repetition_penalty = repetition_penalty
+        self._streaming = streaming
+
+    def _build_payload(
+        self,
+        text: str,
+        voice: str | None,
+        temperature: float | None,
+        repetition_penalty: float | None,
+        streaming: bool,
+    ) -> bytes:
+        """Encode the request body, falling back to the engine defaults."""
+        payload = {
+            **self._payload_static,
+            "text": text,
+            "reference_id": voice if voice is not None else self._voice,
+            "streaming": streaming,
+            "repetition_penalty": repetition_penalty if repetition_penalty is not None else self._repetition_penalty,
+            "temperature": temperature if temperature is not None else self._temperature,
+        }
+        _LOGGER.debug("CynVoice API request: %s", payload)
+        return json_bytes(payload)
+
+    def _post(self, body: bytes, timeout: aiohttp.ClientTimeout = _TIMEOUT):
+        """POST an encoded body upstream.
+
+        The body is a few hundred bytes, so send it with an explicit
+        Content-Length rather than ever falling back to chunked encoding.
+        aiohttp already enables TCP_NODELAY on every connection it opens,
+        so the request and the first audio bytes are not held by Nagle.
+        """
+        return self._session.post(
+            self._url,
+            data=body,
+            headers={**_HEADERS, "Content-Length": str(len(body))},
+            timeout=timeout,
+            read_bufsize=CHUNK_SIZE,
+        )
+
+    async def _async_request(
+        self, body: bytes, timeout: aiohttp.ClientTimeout = _TIMEOUT
+    ) -> aiohttp.ClientResponse:
+        """POST an encoded body, retrying once on a stale pooled connection.
+
+        A keep-alive connection the server closed while it sat in the pool
+        only fails once it is reused, before any response has been read, so
+        sending the request again is safe. The retry is best effort: it
+        draws from the same pool and can hit another stale connection, in
+        which case the error is raised.
+        """
+        try:
+            response = await self._post(body, timeout)
+        except aiohttp.ServerDisconnectedError:
+            _LOGGER.debug("CynVoice connection was closed by the server, retrying")
+            response = await self._post(body, timeout)
+        self._last_response = time.monotonic()
+        return response
+
+    async def async_warm_connection(self) -> None:
+        """Open a pooled keep-alive connection to the API host.
+
+        Used to overlap connection setup with work that has to finish before
+        the TTS request itself can be sent. Does nothing when the API
+        answered within the session's keep-alive timeout, since a pooled
+        connection is then most likely still open.
+        """
+        if time.monotonic() - self._last_response < self._keepalive_timeout:
+            return
+        try:
+            async with self._session.head(self._url.origin(), timeout=_WARM_TIMEOUT):
+                self._last_response = time.monotonic()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.debug("CynVoice connection warm-up failed: %s", e)
+
+    async def async_warm_up(self) -> None:
+        """Synthesize a throwaway utterance so the backend loads its model.
+
+        Bypasses the cache and never raises; a failure only means the first
+        real request pays the cold start instead.
+        """
+        body = self._build_payload(".", None, None, None, False)
+        try:
+            async with await self._async_request(body, _WARM_UP_TIMEOUT) as response:
+                response.raise_for_status()
+                await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            _LOGGER.debug("CynVoice warm-up request failed: %s", e)
+            return
+        _LOGGER.debug("CynVoice backend warmed up")
 
     async def async_get_tts(
         self,
@@ -28,53 +182,184 @@ class CynVoiceEngine:
         voice: str | None = None,
         temperature: float | None = None,
         repetition_penalty: float | None = None,
-        streaming: bool | None = None,
     ) -> AudioResponse:
         """Async TTS request."""
-        
         # Resolve parameters
         voice = voice if voice is not None else self._voice
         temperature = temperature if temperature is not None else self._temperature
         repetition_penalty = repetition_penalty if repetition_penalty is not None else self._repetition_penalty
-        
-        # Force streaming=False in payload to match our current stable strategy
-        
-        headers = {
-            "Content-Type": "application/json",
-            "accept": "*/*"
-        }
 
-        payload = {
-            "text": text,
-            "chunk_length": 200,
-            "format": "wav",
-            "references": [],
-            "reference_id": voice,
-            "seed": None,
-            "use_memory_cache": "on",
-            "normalize": True,
-            "streaming": False,
-            "max_new_tokens": 1024,
-            "top_p": 0.8,
-            "repetition_penalty": repetition_penalty,
-            "temperature": temperature
-        }
+        key = cache_key(str(self._url), text, voice, temperature, repetition_penalty)
+        if self._cache is not None:
+            data = await self._cache.async_get(key)
+            if data is not None:
+                _LOGGER.debug("CynVoice cache hit: %s", key)
+                return AudioResponse(data)
 
-        _LOGGER.debug("CynVoice API request: %s", payload)
+        # Coalesce identical concurrent requests into a single upstream call
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return AudioResponse(await self._async_join(key, pending))
+
+        task = asyncio.create_task(
+            self._async_fetch(key, text, voice, temperature, repetition_penalty)
+        )
+        self._track(key, task)
+
+        # Shield so one cancelled caller does not abort the shared request
+        return AudioResponse(await asyncio.shield(task))
+
+    def _track(self, key: str, future: asyncio.Future[bytes | None]) -> None:
+        """Let identical requests join a synthesis until it finishes."""
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+    async def _async_join(self, key: str, future: asyncio.Future[bytes | None]) -> bytes:
+        """Wait for the complete audio of a synthesis another request started.
+
+        The future is waited on rather than awaited, so neither side's
+        cancellation propagates to the other.
+        """
+        _LOGGER.debug("Joining in-flight CynVoice request: %s", key)
+        await asyncio.wait([future])
+        if future.cancelled() or (data := future.result()) is None:
+            raise HomeAssistantError("The TTS request this one joined did not complete")
+        return data
+
+    async def _async_fetch(
+        self,
+        key: str,
+        text: str,
+        voice: str,
+        temperature: float,
+        repetition_penalty: float,
+    ) -> bytes:
+        """Fetch a complete response upstream and cache it."""
+        body = self._build_payload(text, voice, temperature, repetition_penalty, False)
 
         try:
-            # Use a longer timeout for TTS generation
-            timeout = aiohttp.ClientTimeout(total=60)
-            async with self._session.post(
-                self._url,
-                json=payload,
-                headers=headers,
-                timeout=timeout
-            ) as response:
+            async with await self._async_request(body) as response:
                 response.raise_for_status()
                 data = await response.read()
-                return AudioResponse(data)
 
         except Exception as e:
             _LOGGER.error("Error fetching TTS: %s", e)
             raise HomeAssistantError(f"Error fetching TTS: {e}") from e
+
+        if self._cache is not None:
+            self._cache.async_store(key, data)
+        return data
+
+    async def async_stream_tts(
+        self,
+        text: str,
+        voice: str | None = None,
+        temperature: float | None = None,
+        repetition_penalty: float | None = None,
+    ) -> AsyncGenerator[bytes, None]:
+        """Stream TTS audio chunks over the shared session.
+
+        Upstream reads run in a separate task feeding a bounded queue, so a
+        briefly stalled consumer does not immediately backpressure the server.
+        Chunks are yielded as they arrive and the complete response is
+        cached once the stream finishes.
+        """
+        # Resolve parameters
+        voice = voice if voice is not None else self._voice
+        temperature = temperature if temperature is not None else self._temperature
+        repetition_penalty = repetition_penalty if repetition_penalty is not None else self._repetition_penalty
+
+        key = cache_key(str(self._url), text, voice, temperature, repetition_penalty)
+        if self._cache is not None:
+            data = await self._cache.async_get(key)
+            if data is not None:
+                _LOGGER.debug("CynVoice cache hit: %s", key)
+                yield data
+                return
+
+        # An identical synthesis is already running; reuse it instead of
+        # starting a second one on the server
+        pending = self._inflight.get(key)
+        if pending is not None:
+            yield await self._async_join(key, pending)
+            return
+
+        body = self._build_payload(text, voice, temperature, repetition_penalty, True)
+
+        queue: asyncio.Queue[bytes | Exception | None] = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        # Identical requests arriving while this one streams get the
+        # complete audio once it has been received
+        result: asyncio.Future[bytes | None] = asyncio.get_running_loop().create_future()
+        self._track(key, result)
+        producer = asyncio.create_task(self._async_pump(key, body, queue, result))
+        try:
+            finished = False
+            while not finished:
+                item = await queue.get()
+                # Coalesce chunks that queued up while the consumer was busy
+                # into one write, without ever waiting for more to arrive
+                batch: list[bytes] = []
+                size = 0
+                while True:
+                    if item is None:
+                        finished = True
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    batch.append(item)
+                    size += len(item)
+                    if size >= CHUNK_SIZE or queue.empty():
+                        break
+                    item = queue.get_nowait()
+                if batch:
+                    yield b"".join(batch)
+        finally:
+            producer.cancel()
+            result.cancel()
+
+    async def _async_pump(
+        self,
+        key: str,
+        body: bytes,
+        queue: asyncio.Queue[bytes | Exception | None],
+        result: asyncio.Future[bytes | None],
+    ) -> None:
+        """Read the upstream response into the queue, ending with None.
+
+        The complete audio is also collected and set on result.
+        """
+        audio = bytearray()
+        try:
+            async with await self._async_request(body) as response:
+                response.raise_for_status()
+                try:
+                    # Forward whatever is buffered as soon as it arrives
+                    # instead of waiting to fill fixed-size chunks; b"" marks EOF.
+                    while chunk := await response.content.readany():
+                        await queue.put(chunk)
+                        audio += chunk
+                except asyncio.CancelledError:
+                    # The consumer went away: drop the connection rather than
+                    # returning it to the pool so the server stops synthesizing
+                    response.close()
+                    raise
+
+        except asyncio.CancelledError:
+            _LOGGER.debug("CynVoice streaming was cancelled")
+            raise
+        except Exception as e:
+            _LOGGER.error("Error streaming TTS: %s", e)
+            error = HomeAssistantError(f"Error streaming TTS: {e}")
+            error.__cause__ = e
+            result.set_result(None)
+            await queue.put(error)
+            return
+
+        # Streamed WAV headers carry placeholder sizes, fix them up so
+        # the cached and shared copy is a regular file
+        data = merge_wavs([audio]) if audio[:4] == b"RIFF" else bytes(audio)
+        if self._cache is not None and data:
+            self._cache.async_store(key, data)
+        result.set_result(data or None)
+
+        await queue.put(None)
@@ -1,23 +1,29 @@
 """Support for CynVoice TTS."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from typing import Any
-from functools import partial
+import re
+from collections.abc import Mapping
+from typing import Any, AsyncGenerator
 import asyncio
 
 import voluptuous as vol
 
 from homeassistant.components.tts import (
     TextToSpeechEntity,
+    TTSAudioRequest,
+    TTSAudioResponse,
     PLATFORM_SCHEMA,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
 
 from .const import (
     CONF_API_URL,
@@ -25,19 +31,50 @@ from .const import (
     CONF_TEMPERATURE,
     CONF_REPETITION_PENALTY,
     CONF_STREAMING,
+    CONF_PARALLEL_SEGMENTS,
+    CONF_ASSUME_FIXED_FORMAT,
+    CONF_THREAD_POOL_SIZE,
     DEFAULT_URL,
     DEFAULT_VOICE,
     DEFAULT_TEMPERATURE,
     DEFAULT_REPETITION_PENALTY,
     DEFAULT_STREAMING,
+    DEFAULT_PARALLEL_SEGMENTS,
+    MAX_PARALLEL_SEGMENTS,
+    DEFAULT_ASSUME_FIXED_FORMAT,
+    DEFAULT_THREAD_POOL_SIZE,
     DOMAIN,
+    CACHE_DIR,
+    KEEPALIVE_TIMEOUT,
+    WAV_SAMPLE_RATE,
+    WAV_CHANNELS,
+    WAV_SAMPLE_WIDTH,
+)
+from .cache import AudioCache, CACHE_SWEEP_INTERVAL
+from .cynvoice_engine import DEFAULT_KEEPALIVE_TIMEOUT, CynVoiceEngine
+from .utils import (
+    build_wav_header,
+    find_wav_data_offset,
+    merge_wavs,
+    wav_data_offset,
+    wav_streaming_header,
 )
-from .cynvoice_engine import CynVoiceEngine
 
 _LOGGER = logging.getLogger(__name__)
 
 SUPPORTED_LANGUAGES = ["en"]
 
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+
+# Header sent ahead of the audio when the output format is assumed fixed
+CYNVOICE_WAV_HEADER = build_wav_header(WAV_SAMPLE_RATE, WAV_CHANNELS, WAV_SAMPLE_WIDTH)
+# Give up looking for an upstream WAV header after this many bytes
+_MAX_WAV_HEADER_SIZE = 4096
+# 100 ms of silence, returned for messages with nothing to pronounce
+_SILENCE_WAV = merge_wavs(
+    [CYNVOICE_WAV_HEADER + bytes(WAV_SAMPLE_RATE // 10 * WAV_CHANNELS * WAV_SAMPLE_WIDTH)]
+)
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_API_URL, default=DEFAULT_URL): cv.string,
@@ -45,16 +82,52 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
         vol.Optional(CONF_TEMPERATURE, default=DEFAULT_TEMPERATURE): vol.Coerce(float),
         vol.Optional(CONF_REPETITION_PENALTY, default=DEFAULT_REPETITION_PENALTY): vol.Coerce(float),
         vol.Optional(CONF_STREAMING, default=DEFAULT_STREAMING): cv.boolean,
+        vol.Optional(CONF_PARALLEL_SEGMENTS, default=DEFAULT_PARALLEL_SEGMENTS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_PARALLEL_SEGMENTS)
+        ),
+        vol.Optional(CONF_ASSUME_FIXED_FORMAT, default=DEFAULT_ASSUME_FIXED_FORMAT): cv.boolean,
+        vol.Optional(CONF_THREAD_POOL_SIZE, default=DEFAULT_THREAD_POOL_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
     }
 )
 
+
+def _is_speakable(text: str) -> bool:
+    """Return whether text has anything to pronounce, not just punctuation."""
+    return any(char.isalnum() for char in text)
+
+
+def _parse_parallel_segments(value: Any) -> int:
+    """Parse a parallel_segments option, clamped to the supported range."""
+    try:
+        return min(max(int(value), 1), MAX_PARALLEL_SEGMENTS)
+    except (TypeError, ValueError) as e:
+        raise HomeAssistantError(f"Invalid {CONF_PARALLEL_SEGMENTS}: {value!r}") from e
+
+
+def _split_sentences(text: str) -> list[str]:
+    """Split text on sentence boundaries, dropping empty pieces."""
+    return [sentence for sentence in _SENTENCE_SPLIT.split(text.strip()) if sentence]
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up CynVoice TTS from a config entry."""
-    async_add_entities([CynVoiceEntity(hass, config_entry)])
+    entity = CynVoiceEntity(hass, config_entry)
+    async_add_entities([entity])
+
+    async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Apply new options without tearing down the entity."""
+        entity.apply_options(entry.options)
+
+    config_entry.async_on_unload(config_entry.add_update_listener(async_options_updated))
+    # Load the backend model now rather than on the first user request
+    config_entry.async_create_background_task(
+        hass, entity.async_warm_up(), "cynvoice_warmup"
+    )
 
 async def async_setup_platform(
     hass: HomeAssistant,
@@ -79,26 +152,98 @@ class CynVoiceEntity(TextToSpeechEntity):
              self._config = config.data
              self._options = config.options
              self._attr_unique_id = config.entry_id
+             # Dedicated connection pool created in async_setup_entry
+             session = hass.data[DOMAIN][config.entry_id]
+             keepalive_timeout = KEEPALIVE_TIMEOUT
         else:
              self._config = config
              self._options = {}
              self._attr_unique_id = "cynvoice_yaml"
+             session = async_get_clientsession(hass)
+             # Home Assistant's shared session keeps aiohttp's default
+             keepalive_timeout = DEFAULT_KEEPALIVE_TIMEOUT
+
+        # The cache I/O executor lives while the entity is added to hass,
+        # which can happen more than once (e.g. after an entity_id rename)
+        self._thread_pool_size = self._get_option_or_config(
+            CONF_THREAD_POOL_SIZE, DEFAULT_THREAD_POOL_SIZE
+        )
+        self._executor: ThreadPoolExecutor | None = None
+        # Each entity owns its cache directory and index
+        self._cache = AudioCache(hass, hass.config.path(CACHE_DIR, self._attr_unique_id))
+
+        # Per-request option fallbacks, resolved once
+        self._defaults = self._resolve_defaults()
 
         # Initialize engine
-        session = async_get_clientsession(hass)
         self._engine = CynVoiceEngine(
             session=session,
             url=self._get_option_or_config(CONF_API_URL, DEFAULT_URL),
-            voice=self._get_option_or_config(CONF_VOICE, DEFAULT_VOICE),
-            temperature=self._get_option_or_config(CONF_TEMPERATURE, DEFAULT_TEMPERATURE),
-            repetition_penalty=self._get_option_or_config(CONF_REPETITION_PENALTY, DEFAULT_REPETITION_PENALTY),
-            streaming=self._get_option_or_config(CONF_STREAMING, DEFAULT_STREAMING),
+            voice=self._defaults[CONF_VOICE],
+            temperature=self._defaults[CONF_TEMPERATURE],
+            repetition_penalty=self._defaults[CONF_REPETITION_PENALTY],
+            streaming=self._defaults[CONF_STREAMING],
+            cache=self._cache,
+            keepalive_timeout=keepalive_timeout,
         )
 
     def _get_option_or_config(self, key: str, default: Any) -> Any:
         """Get value from options, falling back to config, then default."""
         return self._options.get(key, self._config.get(key, default))
 
+    def _resolve_defaults(self) -> dict[str, Any]:
+        """Resolve the fallback for every per-request option."""
+        return {
+            CONF_VOICE: self._get_option_or_config(CONF_VOICE, DEFAULT_VOICE),
+            CONF_TEMPERATURE: self._get_option_or_config(CONF_TEMPERATURE, DEFAULT_TEMPERATURE),
+            CONF_REPETITION_PENALTY: self._get_option_or_config(CONF_REPETITION_PENALTY, DEFAULT_REPETITION_PENALTY),
+            CONF_STREAMING: self._get_option_or_config(CONF_STREAMING, DEFAULT_STREAMING),
+            CONF_PARALLEL_SEGMENTS: self._get_option_or_config(CONF_PARALLEL_SEGMENTS, DEFAULT_PARALLEL_SEGMENTS),
+            CONF_ASSUME_FIXED_FORMAT: self._get_option_or_config(CONF_ASSUME_FIXED_FORMAT, DEFAULT_ASSUME_FIXED_FORMAT),
+        }
+
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Use updated config entry options for subsequent requests.
+
+        The engine, its connection pool and the cache stay in place. Cache
+        keys cover every synthesis parameter, so cached audio for the old
+        settings can never be served for the new ones.
+        """
+        self._options = options
+        self._defaults = d = self._resolve_defaults()
+        self._engine.set_defaults(
+            voice=d[CONF_VOICE],
+            temperature=d[CONF_TEMPERATURE],
+            repetition_penalty=d[CONF_REPETITION_PENALTY],
+            streaming=d[CONF_STREAMING],
+        )
+        _LOGGER.debug("CynVoice options updated: %s", d)
+
+    async def async_warm_up(self) -> None:
+        """Send a tiny request so the backend is ready for the first message."""
+        await self._engine.async_warm_up()
+
+    async def async_added_to_hass(self) -> None:
+        """Start the cache I/O executor and schedule removal of expired entries."""
+        await super().async_added_to_hass()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self._thread_pool_size, thread_name_prefix="cynvoice_tts"
+        )
+        self._cache.open(self._executor)
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass, self._cache.async_sweep, CACHE_SWEEP_INTERVAL
+            )
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Let queued cache I/O finish, then shut down its executor."""
+        self._cache.close()
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await self.hass.async_add_executor_job(executor.shutdown)
+        await super().async_will_remove_from_hass()
+
     @property
     def default_language(self) -> str:
         """Return the default language."""
@@ -117,6 +262,8 @@ class CynVoiceEntity(TextToSpeechEntity):
             CONF_TEMPERATURE,
             CONF_REPETITION_PENALTY,
             CONF_STREAMING,
+            CONF_PARALLEL_SEGMENTS,
+            CONF_ASSUME_FIXED_FORMAT,
         ]
 
     async def async_get_tts_audio(
@@ -124,20 +271,41 @@ class CynVoiceEntity(TextToSpeechEntity):
     ) -> tuple[str, bytes] | None:
         """Load TTS from CynVoice."""
         options = options or {}
-        
+
+        # Skip the API round-trip for messages with nothing to synthesize
+        if not message or message.isspace():
+            return None
+        if not _is_speakable(message):
+            return "wav", _SILENCE_WAV
+
         # Override parameters from options if present
-        voice = options.get(CONF_VOICE, self._engine._voice)
-        temperature = options.get(CONF_TEMPERATURE, self._engine._temperature)
-        repetition_penalty = options.get(CONF_REPETITION_PENALTY, self._engine._repetition_penalty)
-        streaming = options.get(CONF_STREAMING, self._engine._streaming)
+        d = self._defaults
+        voice = options.get(CONF_VOICE, d[CONF_VOICE])
+        temperature = options.get(CONF_TEMPERATURE, d[CONF_TEMPERATURE])
+        repetition_penalty = options.get(CONF_REPETITION_PENALTY, d[CONF_REPETITION_PENALTY])
 
         try:
+            parallel_segments = _parse_parallel_segments(
+                options.get(CONF_PARALLEL_SEGMENTS, d[CONF_PARALLEL_SEGMENTS])
+            )
+            sentences = _split_sentences(message) if parallel_segments > 1 else []
+
+            if len(sentences) > 1:
+                tasks = self._async_synthesize_segments(
+                    sentences, voice, temperature, repetition_penalty, parallel_segments
+                )
+                try:
+                    segments = await asyncio.gather(*tasks)
+                finally:
+                    for task in tasks:
+                        task.cancel()
+                return "wav", merge_wavs(segments)
+
             audio_response = await self._engine.async_get_tts(
                 text=message,
                 voice=voice,
                 temperature=temperature,
                 repetition_penalty=repetition_penalty,
-                streaming=streaming
             )
             
             if not audio_response:
@@ -149,3 +317,145 @@ class CynVoiceEntity(TextToSpeechEntity):
         except Exception as e:
             _LOGGER.error("Error generating TTS: %s", e)
             return None
+
+    async def async_stream_tts_audio(
+        self, request: TTSAudioRequest
+    ) -> TTSAudioResponse:
+        """Stream TTS from CynVoice.
+
+        With streaming enabled, audio is forwarded as it arrives from the
+        API; otherwise the complete response is fetched and yielded at once.
+        """
+        options = request.options or {}
+        d = self._defaults
+        streaming = options.get(CONF_STREAMING, d[CONF_STREAMING])
+
+        # CynVoice needs the full text up front; when streaming, open the
+        # upstream connection while text is still arriving (e.g. from an
+        # LLM). It is never waited for: once the text is complete it is
+        # cancelled if unfinished, which also covers cache hits and
+        # messages answered locally.
+        warm = (
+            self.hass.async_create_task(self._engine.async_warm_connection())
+            if streaming
+            else None
+        )
+        message = "".join([chunk async for chunk in request.message_gen])
+        if warm is not None and not warm.done():
+            warm.cancel()
+
+        # Messages without speech are answered locally, never streamed
+        if not streaming or not _is_speakable(message):
+            result = await self.async_get_tts_audio(message, request.language, options)
+            if result is None:
+                raise HomeAssistantError("Error generating TTS")
+
+            async def buffered_gen() -> AsyncGenerator[bytes, None]:
+                yield result[1]
+
+            return TTSAudioResponse(extension="wav", data_gen=buffered_gen())
+
+        voice = options.get(CONF_VOICE, d[CONF_VOICE])
+        temperature = options.get(CONF_TEMPERATURE, d[CONF_TEMPERATURE])
+        repetition_penalty = options.get(CONF_REPETITION_PENALTY, d[CONF_REPETITION_PENALTY])
+        parallel_segments = _parse_parallel_segments(
+            options.get(CONF_PARALLEL_SEGMENTS, d[CONF_PARALLEL_SEGMENTS])
+        )
+
+        sentences = _split_sentences(message) if parallel_segments > 1 else []
+        if len(sentences) > 1:
+            data_gen = self._async_stream_segments(
+                sentences, voice, temperature, repetition_penalty, parallel_segments
+            )
+        else:
+            data_gen = self._engine.async_stream_tts(
+                text=message,
+                voice=voice,
+                temperature=temperature,
+                repetition_penalty=repetition_penalty,
+            )
+
+        if options.get(CONF_ASSUME_FIXED_FORMAT, d[CONF_ASSUME_FIXED_FORMAT]):
+            data_gen = self._async_stream_fixed_format(data_gen)
+
+        return TTSAudioResponse(extension="wav", data_gen=data_gen)
+
+    async def _async_stream_fixed_format(
+        self, stream: AsyncGenerator[bytes, None]
+    ) -> AsyncGenerator[bytes, None]:
+        """Send a prebuilt WAV header first, then only the upstream samples.
+
+        The client can start buffering before the API has answered; the
+        upstream WAV header is stripped once it has been received.
+        """
+        yield CYNVOICE_WAV_HEADER
+
+        header = b""
+        async for chunk in stream:
+            if header is not None:
+                # The upstream header nearly always fits in the first chunk;
+                # only concatenate when it was split
+                header = header + chunk if header else chunk
+                offset = find_wav_data_offset(header)
+                if offset is None:
+                    if len(header) < _MAX_WAV_HEADER_SIZE:
+                        continue
+                    offset = 0
+                chunk = header[offset:] if offset else header
+                header = None
+                if not chunk:
+                    continue
+            yield chunk
+
+    def _async_synthesize_segments(
+        self,
+        sentences: list[str],
+        voice: str,
+        temperature: float,
+        repetition_penalty: float,
+        parallel_segments: int,
+    ) -> list[asyncio.Task[bytes]]:
+        """Start synthesizing sentences, at most parallel_segments at a time."""
+        semaphore = asyncio.Semaphore(parallel_segments)
+
+        async def fetch(sentence: str) -> bytes:
+            async with semaphore:
+                audio_response = await self._engine.async_get_tts(
+                    text=sentence,
+                    voice=voice,
+                    temperature=temperature,
+                    repetition_penalty=repetition_penalty,
+                )
+                return audio_response.content
+
+        _LOGGER.debug("Synthesizing %d segments, %d at a time", len(sentences), parallel_segments)
+        return [self.hass.async_create_task(fetch(sentence)) for sentence in sentences]
+
+    async def _async_stream_segments(
+        self,
+        sentences: list[str],
+        voice: str,
+        temperature: float,
+        repetition_penalty: float,
+        parallel_segments: int,
+    ) -> AsyncGenerator[bytes, None]:
+        """Synthesize sentences concurrently and stream them in order.
+
+        The first segment's header is re-emitted with unknown-length size
+        fields and later segments contribute only their samples, so the
+        client receives a single continuous WAV stream.
+        """
+        tasks = self._async_synthesize_segments(
+            sentences, voice, temperature, repetition_penalty, parallel_segments
+        )
+        try:
+            for index, task in enumerate(tasks):
+                data = await task
+                offset = wav_data_offset(data)
+                # Non-WAV payloads have no header to rewrite
+                if index == 0 and offset:
+                    yield wav_streaming_header(data[:offset])
+                yield data[offset:]
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,94 @@
+"""Audio helpers for CynVoice."""
+from __future__ import annotations
+
+import struct
+
+# Size of a canonical PCM WAV header
+WAV_HEADER_SIZE = 44
+# RIFF size value used for streams of unknown length
+WAV_UNKNOWN_SIZE = 0xFFFFFFFF
+
+
+def find_wav_data_offset(data: bytes) -> int | None:
+    """Return the offset of the sample data in a WAV buffer.
+
+    Walks the RIFF chunks to find the ``data`` chunk. Returns 0 when the
+    buffer does not start with a RIFF/WAVE header and None when the header
+    is not complete yet.
+    """
+    if len(data) < 12:
+        return None
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return 0
+
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        (size,) = struct.unpack_from("<I", data, pos + 4)
+        if chunk_id == b"data":
+            return pos + 8
+        # Chunks are word aligned
+        pos += 8 + size + (size & 1)
+
+    return None
+
+
+def wav_data_offset(data: bytes) -> int:
+    """Return the offset of the sample data in a complete WAV buffer.
+
+    Returns 0 for buffers that are not RIFF/WAVE and falls back to the
+    canonical header size when no ``data`` chunk is found.
+    """
+    offset = find_wav_data_offset(data)
+    return WAV_HEADER_SIZE if offset is None else offset
+
+
+def build_wav_header(sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """Build a PCM WAV header for a stream of unknown length."""
+    block_align = channels * sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        WAV_UNKNOWN_SIZE,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        sample_rate * block_align,
+        block_align,
+        sample_width * 8,
+        b"data",
+        WAV_UNKNOWN_SIZE,
+    )
+
+
+def wav_streaming_header(header: bytes) -> bytes:
+    """Return a copy of a WAV header with its size fields marked unknown.
+
+    ``header`` must end at the start of the ``data`` chunk's samples.
+    """
+    patched = bytearray(header)
+    struct.pack_into("<I", patched, 4, WAV_UNKNOWN_SIZE)
+    struct.pack_into("<I", patched, len(patched) - 4, WAV_UNKNOWN_SIZE)
+    return bytes(patched)
+
+
+def merge_wavs(segments: list[bytes]) -> bytes:
+    """Concatenate WAV responses into one WAV with corrected size fields.
+
+    The first segment's header is kept; all segments must share its format.
+    Payloads that do not start with a complete WAV header are joined as is.
+    """
+    first = segments[0]
+    offset = wav_data_offset(first)
+    if not offset or offset > len(first):
+        return b"".join(segments)
+    samples = [memoryview(segment)[wav_data_offset(segment):] for segment in segments]
+    data_size = sum(len(sample) for sample in samples)
+
+    header = bytearray(first[:offset])
+    struct.pack_into("<I", header, 4, offset - 8 + data_size)
+    struct.pack_into("<I", header, offset - 4, data_size)
+    return b"".join([header, *samples])